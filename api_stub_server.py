@@ -0,0 +1,237 @@
+# api_stub_server.py
+# Local stand-in for the MLB StatsAPI and Sportradar endpoints used by mlb_model.py and baseball_populate.py.
+# Serves synthetic payloads shaped like the real APIs, with optional latency, 429 injection and payload scale,
+# so ingestion and dashboard refresh can be load-tested offline.
+#
+# Usage:
+#   python api_stub_server.py --port 8765 --latency-ms 80 --jitter-ms 40 --rate-429 0.05 --scale 4
+#   export BBB_MLB_API_BASE=http://127.0.0.1:8765 BBB_SPORTRADAR_API_BASE=http://127.0.0.1:8765 SPORTRADAR_API_KEY=stub
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from entity_index import TEAM_NAME_MAP
+
+# -----------------------------
+# SYNTHETIC PAYLOADS
+# -----------------------------
+
+# Stable fake ids so repeated requests describe the same league
+TEAMS = [
+    {
+        "abbr": abbr,
+        "sportradar_id": str(uuid.uuid5(uuid.NAMESPACE_URL, f"bbb-stub-team-{abbr}")),
+        "mlb_id": 100 + i,
+        "mlb_name": mlb_name,
+        "market": mlb_name.rsplit(" ", 1)[0] if " " in mlb_name else mlb_name,
+        "name": mlb_name.rsplit(" ", 1)[-1],
+        "venue": f"{abbr} Stub Park",
+    }
+    for i, (abbr, (mlb_name, _)) in enumerate(sorted(TEAM_NAME_MAP.items()))
+]
+TEAMS_BY_SPORTRADAR_ID = {team["sportradar_id"]: team for team in TEAMS}
+
+
+def daily_matchups(day, scale):
+    """Returns (home, away) pairs for a day; scale multiplies the 15 games a full slate has."""
+    rng = random.Random(day.toordinal())
+    pairs = []
+    for _ in range(max(1, int(15 * scale))):
+        home, away = rng.sample(TEAMS, 2)
+        pairs.append((home, away))
+    return pairs
+
+
+def mlb_schedule_payload(start_date, end_date, scale):
+    dates = []
+    day = start_date
+    while day <= end_date:
+        games = []
+        for n, (home, away) in enumerate(daily_matchups(day, scale)):
+            final = day < date.today()
+            games.append({
+                "gamePk": day.toordinal() * 1000 + n,
+                "gameDate": f"{day.isoformat()}T{17 + n % 6}:{(n * 5) % 60:02d}:00Z",
+                "status": {"detailedState": "Final" if final else "Scheduled"},
+                "venue": {"name": home["venue"]},
+                "teams": {
+                    side: {
+                        "team": {"id": team["mlb_id"], "name": team["mlb_name"]},
+                        "probablePitcher": {"fullName": f"{team['abbr']} Starter {n}"},
+                        "score": (n + len(team["abbr"])) % 9 if final else 0,
+                    }
+                    for side, team in (("home", home), ("away", away))
+                },
+            })
+        dates.append({"date": day.isoformat(), "games": games})
+        day += timedelta(days=1)
+    return {"dates": dates}
+
+
+def sportradar_teams_payload():
+    return {"teams": [
+        {"id": team["sportradar_id"], "name": team["name"], "market": team["market"], "abbr": team["abbr"]}
+        for team in TEAMS
+    ]}
+
+
+def sportradar_statistics_payload(team_id, year, scale):
+    rng = random.Random(team_id)
+    # Padding mimics the many per-split fields of the real payload; scale grows the body size
+    padding = {f"split_{i}": rng.random() for i in range(int(50 * scale))}
+    return {
+        "season": {"id": str(uuid.uuid5(uuid.NAMESPACE_URL, f"bbb-stub-season-{year}")), "year": int(year), "type": "REG"},
+        "statistics": {
+            "hitting": {"overall": {"avg": round(rng.uniform(0.220, 0.280), 3), "runs": rng.randint(400, 900), **padding}},
+            "pitching": {"overall": {"era": round(rng.uniform(3.0, 5.5), 2), "k": rng.randint(900, 1600), **padding}},
+            "fielding": {"overall": {"fpct": round(rng.uniform(0.975, 0.992), 3), "e": rng.randint(50, 120), **padding}},
+        },
+    }
+
+
+def sportradar_schedule_payload(year, scale):
+    games = []
+    day = date(int(year), 3, 27)
+    while day <= date(int(year), 9, 28):
+        for n, (home, away) in enumerate(daily_matchups(day, scale)):
+            games.append({
+                "id": str(uuid.uuid5(uuid.NAMESPACE_URL, f"bbb-stub-game-{day.isoformat()}-{n}")),
+                "scheduled": f"{day.isoformat()}T{17 + n % 6}:{(n * 5) % 60:02d}:00+00:00",
+                "status": "closed" if day < date.today() else "scheduled",
+                "venue": {"name": home["venue"]},
+                "home": {"id": home["sportradar_id"], "abbr": home["abbr"]},
+                "away": {"id": away["sportradar_id"], "abbr": away["abbr"]},
+            })
+        day += timedelta(days=1)
+    return {"games": games}
+
+
+# -----------------------------
+# HTTP SERVER
+# -----------------------------
+
+ROUTES = [
+    (re.compile(r"^/api/v1/schedule$"), "mlb_schedule"),
+    (re.compile(r"^/mlb/trial/v8/en/league/teams\.json$"), "sr_teams"),
+    (re.compile(r"^/mlb/trial/v8/en/seasons/(?P<year>\d+)/REG/teams/(?P<team_id>[\w-]+)/statistics\.json$"), "sr_statistics"),
+    (re.compile(r"^/mlb/trial/v8/en/games/(?P<year>\d+)/REG/schedule\.json$"), "sr_schedule"),
+]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # Keep connections alive like the real APIs do; every response sends Content-Length
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; with Nagle on, kept-alive connections stall ~40ms on delayed ACKs
+    disable_nagle_algorithm = True
+    # Set by main(); shared by all handler threads
+    options = None
+    stats = {"requests": 0, "throttled": 0}
+    stats_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        if self.options.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        options = self.options
+        with self.stats_lock:
+            self.stats["requests"] += 1
+
+        delay = options.latency_ms + random.uniform(0, options.jitter_ms)
+        if delay:
+            time.sleep(delay / 1000)
+
+        if random.random() < options.rate_429:
+            with self.stats_lock:
+                self.stats["throttled"] += 1
+            self.send_json(429, {"message": "Too Many Requests"}, {"Retry-After": "1"})
+            return
+
+        parts = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        for pattern, route in ROUTES:
+            match = pattern.match(parts.path)
+            if match:
+                break
+        else:
+            self.send_json(404, {"message": f"No stub for {parts.path}"})
+            return
+
+        try:
+            if route == "mlb_schedule":
+                start = datetime.strptime(query.get("startDate", date.today().isoformat()), "%Y-%m-%d").date()
+                end = datetime.strptime(query.get("endDate", start.isoformat()), "%Y-%m-%d").date()
+                payload = mlb_schedule_payload(start, end, options.scale)
+            elif route == "sr_teams":
+                payload = sportradar_teams_payload()
+            elif route == "sr_statistics":
+                if match["team_id"] not in TEAMS_BY_SPORTRADAR_ID:
+                    self.send_json(404, {"message": f"Unknown team {match['team_id']}"})
+                    return
+                payload = sportradar_statistics_payload(match["team_id"], match["year"], options.scale)
+            else:
+                payload = sportradar_schedule_payload(match["year"], options.scale)
+        except ValueError as e:
+            self.send_json(400, {"message": str(e)})
+            return
+        self.send_json(200, payload)
+
+
+class StubServer(ThreadingHTTPServer):
+    # socketserver's default backlog of 5 overflows at stress rates, and the resulting SYN retries
+    # would show up as ~1s tail latency in load_test.py instead of ingestion throughput
+    request_queue_size = 512
+    daemon_threads = True
+
+
+def start_server(host="127.0.0.1", port=8765, latency_ms=0, jitter_ms=0, rate_429=0.0, scale=1.0, verbose=False):
+    """Starts the stub server on a background thread and returns it; call server.shutdown() to stop."""
+    StubHandler.options = argparse.Namespace(
+        latency_ms=latency_ms, jitter_ms=jitter_ms, rate_429=rate_429, scale=scale, verbose=verbose
+    )
+    server = StubServer((host, port), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local MLB StatsAPI / Sportradar stand-in for offline load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Fixed delay added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Extra random delay up to this many ms")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--scale", type=float, default=1.0, help="Payload size multiplier (games per day, stat fields)")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    server = start_server(args.host, args.port, args.latency_ms, args.jitter_ms, args.rate_429, args.scale, args.verbose)
+    print(f"Stub API listening on http://{args.host}:{args.port} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print(f"\nServed {StubHandler.stats['requests']} requests ({StubHandler.stats['throttled']} throttled)")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@ import requests
 import os
 import json
 from dotenv import load_dotenv
+from entity_index import build_entity_index
+import http_transport
 
 # Load environment variables from .env file
 load_dotenv()
@@ -75,8 +77,9 @@ def setup_database():
 # Populate teams
 def populate_teams():
     url = TEAMS_API_URL + f"?api_key={API_KEY}"
+    conn = None
     try:
-        response = requests.get(url, timeout=10)
+        response = http_transport.get(url, timeout=10)
         print(f"Fetching teams, Status Code: {response.status_code}")
         response.raise_for_status()
         data = response.json()
@@ -111,7 +114,8 @@ def populate_teams():
     except KeyError as e:
         print(f"KeyError for teams: {e}")
     finally:
-        conn.close()
+        if conn:
+            conn.close()
 
 # Populate statistics
 def populate_statistics():
@@ -124,7 +128,7 @@ def populate_statistics():
     for team_id in team_ids:
         url = STATS_API_URL.format(team_id=team_id) + f"?api_key={API_KEY}"
         try:
-            response = requests.get(url, timeout=10)
+            response = http_transport.get(url, timeout=10)
             print(f"Fetching stats for team {team_id}, Status Code: {response.status_code}")
             response.raise_for_status()
             data = response.json()
@@ -160,8 +164,9 @@ def populate_statistics():
 # Populate schedule
 def populate_schedule():
     url = SCHEDULE_API_URL + f"?api_key={API_KEY}"
+    conn = None
     try:
-        response = requests.get(url, timeout=10)
+        response = http_transport.get(url, timeout=10)
         print(f"Fetching schedule, Status Code: {response.status_code}")
         response.raise_for_status()
         data = response.json()
@@ -202,13 +207,15 @@ def populate_schedule():
     except Exception as e:
         print(f"Unexpected error for schedule: {e}")
     finally:
-        conn.close()
+        if conn:
+            conn.close()
 
 def main():
     setup_database()
     populate_teams()
     populate_statistics()
     populate_schedule()
+    build_entity_index(DB_PATH)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
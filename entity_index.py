@@ -0,0 +1,301 @@
+# entity_index.py
+# Builds a cross-source entity index for teams, games and venues in baseball_analytics.db
+#
+# Three sources name the same things differently:
+#   - Sportradar: team UUIDs and abbrs (teams / schedule tables)
+#   - MLB StatsAPI: GamePk and full team names (mlb_model cache + prediction history)
+#   - Yahoo Sports: short team names like "Toronto" (scraped CSVs)
+# The index assigns each team, game and venue one integer entity_id so cross-source
+# joins are indexed integer lookups instead of string matching.
+
+import sqlite3
+import os
+import csv
+import json
+
+DB_PATH = os.path.abspath('baseball_analytics.db')
+MLB_CACHE_FILE = "mlb_games_cache.json"
+MLB_HISTORY_FILE = "mlb_prediction_history.csv"
+YAHOO_STATS_FILES = ["team_batting_stats.csv", "team_pitching_stats.csv"]
+
+# Sportradar abbr -> (MLB StatsAPI full name, Yahoo Sports short name)
+TEAM_NAME_MAP = {
+    "ATH": ("Athletics", "Athletics"),
+    "ATL": ("Atlanta Braves", "Atlanta"),
+    "AZ": ("Arizona Diamondbacks", "Arizona"),
+    "BAL": ("Baltimore Orioles", "Baltimore"),
+    "BOS": ("Boston Red Sox", "Boston"),
+    "CHC": ("Chicago Cubs", "Chi Cubs"),
+    "CIN": ("Cincinnati Reds", "Cincinnati"),
+    "CLE": ("Cleveland Guardians", "Cleveland"),
+    "COL": ("Colorado Rockies", "Colorado"),
+    "CWS": ("Chicago White Sox", "Chi White Sox"),
+    "DET": ("Detroit Tigers", "Detroit"),
+    "HOU": ("Houston Astros", "Houston"),
+    "KC": ("Kansas City Royals", "Kansas City"),
+    "LAA": ("Los Angeles Angels", "LA Angels"),
+    "LAD": ("Los Angeles Dodgers", "LA Dodgers"),
+    "MIA": ("Miami Marlins", "Miami"),
+    "MIL": ("Milwaukee Brewers", "Milwaukee"),
+    "MIN": ("Minnesota Twins", "Minnesota"),
+    "NYM": ("New York Mets", "NY Mets"),
+    "NYY": ("New York Yankees", "NY Yankees"),
+    "PHI": ("Philadelphia Phillies", "Philadelphia"),
+    "PIT": ("Pittsburgh Pirates", "Pittsburgh"),
+    "SD": ("San Diego Padres", "San Diego"),
+    "SEA": ("Seattle Mariners", "Seattle"),
+    "SF": ("San Francisco Giants", "San Francisco"),
+    "STL": ("St. Louis Cardinals", "St. Louis"),
+    "TB": ("Tampa Bay Rays", "Tampa Bay"),
+    "TEX": ("Texas Rangers", "Texas"),
+    "TOR": ("Toronto Blue Jays", "Toronto"),
+    "WSH": ("Washington Nationals", "Washington"),
+}
+
+# -----------------------------
+# SCHEMA
+# -----------------------------
+
+def setup_entity_tables(conn):
+    """Creates the entity index tables and their lookup indexes if missing."""
+    cursor = conn.cursor()
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS team_entities (
+            entity_id INTEGER PRIMARY KEY,
+            sportradar_id TEXT UNIQUE,
+            abbr TEXT UNIQUE,
+            mlb_name TEXT UNIQUE,
+            yahoo_name TEXT UNIQUE
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS venue_entities (
+            entity_id INTEGER PRIMARY KEY,
+            name TEXT UNIQUE
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS game_entities (
+            entity_id INTEGER PRIMARY KEY,
+            sportradar_game_id TEXT UNIQUE,
+            mlb_game_pk INTEGER UNIQUE,
+            game_date TEXT,
+            scheduled_time TEXT,
+            home_team_entity_id INTEGER,
+            away_team_entity_id INTEGER,
+            venue_entity_id INTEGER,
+            FOREIGN KEY (home_team_entity_id) REFERENCES team_entities(entity_id),
+            FOREIGN KEY (away_team_entity_id) REFERENCES team_entities(entity_id),
+            FOREIGN KEY (venue_entity_id) REFERENCES venue_entities(entity_id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_game_entities_matchup
+        ON game_entities (game_date, home_team_entity_id, away_team_entity_id)
+    ''')
+    conn.commit()
+
+# -----------------------------
+# SOURCE LOADERS
+# -----------------------------
+
+def to_utc_minute(timestamp):
+    """Normalizes '...Z' and '...+00:00' UTC timestamps to 'YYYY-MM-DDTHH:MM'."""
+    return timestamp[:16] if timestamp else None
+
+def load_mlb_games():
+    """Returns MLB StatsAPI games from the dashboard cache and prediction history, keyed by GamePk."""
+    games = {}
+    if os.path.exists(MLB_HISTORY_FILE):
+        with open(MLB_HISTORY_FILE, newline='') as f:
+            for row in csv.DictReader(f):
+                # History only stores "Away @ Home", so split it back into team names
+                away, _, home = row["Game"].partition(" @ ")
+                games[int(row["GamePk"])] = {
+                    "home": home, "away": away, "date": row["Date"], "venue": None
+                }
+    if os.path.exists(MLB_CACHE_FILE):
+        with open(MLB_CACHE_FILE, 'r') as f:
+            cache = json.load(f)
+        for game in cache.get("games", []):
+            games[int(game["GamePk"])] = {
+                "home": game["Home Team"], "away": game["Away Team"],
+                "date": game["Date"], "venue": game.get("Venue")
+            }
+    return games
+
+def load_yahoo_team_names():
+    """Returns the set of team short names found in the scraped Yahoo CSVs."""
+    names = set()
+    for path in YAHOO_STATS_FILES:
+        if os.path.exists(path):
+            with open(path, newline='') as f:
+                names.update(row["Team"] for row in csv.DictReader(f))
+    return names
+
+# -----------------------------
+# INDEX BUILDERS
+# -----------------------------
+
+def index_teams(conn):
+    """Upserts one team entity per MLB club, carrying its Sportradar, MLB and Yahoo keys."""
+    cursor = conn.cursor()
+    # The teams table skips clubs without a market (e.g. ATH), so also take ids from schedule
+    cursor.execute('''
+        SELECT id, abbr FROM teams
+        UNION
+        SELECT home_team_id, home_team_abbr FROM schedule
+        UNION
+        SELECT away_team_id, away_team_abbr FROM schedule
+    ''')
+    sportradar_ids = {abbr: team_id for team_id, abbr in cursor.fetchall() if abbr in TEAM_NAME_MAP}
+
+    yahoo_names = load_yahoo_team_names()
+    for abbr, (mlb_name, yahoo_name) in TEAM_NAME_MAP.items():
+        if yahoo_names and yahoo_name not in yahoo_names:
+            print(f"Yahoo name '{yahoo_name}' for {abbr} not found in scraped stats")
+        cursor.execute('''
+            INSERT INTO team_entities (sportradar_id, abbr, mlb_name, yahoo_name)
+            VALUES (:sportradar_id, :abbr, :mlb_name, :yahoo_name)
+            ON CONFLICT(abbr) DO UPDATE SET
+                sportradar_id = COALESCE(excluded.sportradar_id, sportradar_id),
+                mlb_name = excluded.mlb_name,
+                yahoo_name = excluded.yahoo_name
+        ''', {"sportradar_id": sportradar_ids.get(abbr), "abbr": abbr,
+              "mlb_name": mlb_name, "yahoo_name": yahoo_name})
+    conn.commit()
+
+def index_venues(conn, mlb_games):
+    """Inserts one venue entity per distinct venue name seen in either schedule source."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT DISTINCT venue_name FROM schedule WHERE venue_name IS NOT NULL")
+    names = {row[0] for row in cursor.fetchall()}
+    names.update(game["venue"] for game in mlb_games.values() if game["venue"] and game["venue"] != "Unknown")
+    cursor.executemany("INSERT OR IGNORE INTO venue_entities (name) VALUES (?)", [(name,) for name in names])
+    conn.commit()
+
+def index_games(conn, mlb_games):
+    """Upserts Sportradar games, then attaches each MLB GamePk to its matching game entity."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT sportradar_id, entity_id FROM team_entities WHERE sportradar_id IS NOT NULL")
+    team_by_sportradar = dict(cursor.fetchall())
+    cursor.execute("SELECT mlb_name, entity_id FROM team_entities")
+    team_by_mlb_name = dict(cursor.fetchall())
+    cursor.execute("SELECT name, entity_id FROM venue_entities")
+    venue_by_name = dict(cursor.fetchall())
+
+    cursor.execute("SELECT game_id, scheduled_time, home_team_id, away_team_id, venue_name FROM schedule")
+    for game_id, scheduled_time, home_id, away_id, venue_name in cursor.fetchall():
+        # schedule.date holds a single fallback date, so derive the game date from scheduled_time
+        game_data = {
+            "sportradar_game_id": game_id,
+            "game_date": scheduled_time[:10] if scheduled_time else None,
+            "scheduled_time": to_utc_minute(scheduled_time),
+            "home_team_entity_id": team_by_sportradar.get(home_id),
+            "away_team_entity_id": team_by_sportradar.get(away_id),
+            "venue_entity_id": venue_by_name.get(venue_name)
+        }
+        # An MLB-only row for the same game may predate this schedule row; adopt it so its entity_id is kept
+        conn.execute('''
+            UPDATE game_entities SET sportradar_game_id = :sportradar_game_id
+            WHERE entity_id = (
+                SELECT entity_id FROM game_entities
+                WHERE sportradar_game_id IS NULL AND game_date = :game_date AND scheduled_time = :scheduled_time
+                AND home_team_entity_id = :home_team_entity_id AND away_team_entity_id = :away_team_entity_id
+                LIMIT 1
+            )
+            AND NOT EXISTS (SELECT 1 FROM game_entities WHERE sportradar_game_id = :sportradar_game_id)
+        ''', game_data)
+        conn.execute('''
+            INSERT INTO game_entities (sportradar_game_id, game_date, scheduled_time, home_team_entity_id, away_team_entity_id, venue_entity_id)
+            VALUES (:sportradar_game_id, :game_date, :scheduled_time, :home_team_entity_id, :away_team_entity_id, :venue_entity_id)
+            ON CONFLICT(sportradar_game_id) DO UPDATE SET
+                game_date = excluded.game_date,
+                scheduled_time = excluded.scheduled_time,
+                home_team_entity_id = excluded.home_team_entity_id,
+                away_team_entity_id = excluded.away_team_entity_id,
+                venue_entity_id = excluded.venue_entity_id
+        ''', game_data)
+
+    matched = 0
+    for game_pk, game in mlb_games.items():
+        home = team_by_mlb_name.get(game["home"])
+        away = team_by_mlb_name.get(game["away"])
+        if home is None or away is None:
+            print(f"Skipping GamePk {game_pk}: unknown team in '{game['away']} @ {game['home']}'")
+            continue
+        scheduled = to_utc_minute(game["date"])
+        candidates = conn.execute('''
+            SELECT entity_id, scheduled_time, mlb_game_pk FROM game_entities
+            WHERE game_date = ? AND home_team_entity_id = ? AND away_team_entity_id = ?
+            AND (mlb_game_pk IS NULL OR mlb_game_pk = ?)
+        ''', (scheduled[:10], home, away, game_pk)).fetchall()
+        # Keep an existing link, else prefer an exact start time match so doubleheaders resolve correctly
+        linked = [entity_id for entity_id, sched, pk in candidates if pk == game_pk]
+        exact = [entity_id for entity_id, sched, pk in candidates if sched == scheduled]
+        if linked:
+            entity_id = linked[0]
+        elif exact:
+            entity_id = exact[0]
+        elif len(candidates) == 1:
+            entity_id = candidates[0][0]
+        else:
+            entity_id = None
+
+        if entity_id is not None:
+            conn.execute("UPDATE game_entities SET mlb_game_pk = NULL WHERE mlb_game_pk = ? AND entity_id != ?", (game_pk, entity_id))
+            conn.execute("UPDATE game_entities SET mlb_game_pk = ? WHERE entity_id = ?", (game_pk, entity_id))
+            matched += 1
+        else:
+            # No Sportradar counterpart: keep the MLB game in the index on its own
+            conn.execute('''
+                INSERT INTO game_entities (mlb_game_pk, game_date, scheduled_time, home_team_entity_id, away_team_entity_id, venue_entity_id)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(mlb_game_pk) DO NOTHING
+            ''', (game_pk, scheduled[:10], scheduled, home, away, venue_by_name.get(game["venue"])))
+
+    # Rows left with neither key no longer refer to any source game
+    conn.execute("DELETE FROM game_entities WHERE sportradar_game_id IS NULL AND mlb_game_pk IS NULL")
+    conn.commit()
+    print(f"Matched {matched} of {len(mlb_games)} MLB games to Sportradar games")
+
+def build_entity_index(db_path=DB_PATH):
+    """Builds or refreshes the team, venue and game entity index. Safe to re-run; entity ids are stable."""
+    conn = sqlite3.connect(db_path)
+    try:
+        setup_entity_tables(conn)
+        mlb_games = load_mlb_games()
+        index_teams(conn)
+        index_venues(conn, mlb_games)
+        index_games(conn, mlb_games)
+        print("Entity index built successfully")
+    except sqlite3.Error as e:
+        print(f"SQLite error while building entity index: {e}")
+    finally:
+        conn.close()
+
+# -----------------------------
+# LOOKUPS
+# -----------------------------
+
+TEAM_KEY_COLUMNS = {
+    "sportradar": "sportradar_id",
+    "abbr": "abbr",
+    "mlb": "mlb_name",
+    "yahoo": "yahoo_name",
+}
+
+def resolve_team(conn, source, key):
+    """Returns the team entity_id for a key from the given source ('sportradar', 'abbr', 'mlb', 'yahoo')."""
+    column = TEAM_KEY_COLUMNS[source]
+    row = conn.execute(f"SELECT entity_id FROM team_entities WHERE {column} = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+def resolve_game_pk(conn, game_pk):
+    """Returns (entity_id, sportradar_game_id) for an MLB GamePk, or None if it is not indexed."""
+    return conn.execute(
+        "SELECT entity_id, sportradar_game_id FROM game_entities WHERE mlb_game_pk = ?", (game_pk,)
+    ).fetchone()
+
+if __name__ == "__main__":
+    build_entity_index()
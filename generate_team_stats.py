@@ -8,6 +8,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import pandas as pd
 import time
+import http_transport
 
 # ----------------------
 # Configure Selenium Chrome Driver
@@ -26,12 +27,13 @@ driver = webdriver.Chrome(options=options)
 # ----------------------
 batting_url = "https://sports.yahoo.com/mlb/stats/team/?selectedTable=0&leagueStructure="
 print(f"Loading batting stats page: {batting_url}")
-driver.get(batting_url)
+driver.get(http_transport.browser_url(batting_url))
 
 WebDriverWait(driver, 30).until(
     EC.presence_of_all_elements_located((By.CSS_SELECTOR, "table tbody tr"))
 )
 time.sleep(4)
+http_transport.record_page(batting_url, driver.page_source)
 
 print("Extracting batting table...")
 table = driver.find_element(By.CSS_SELECTOR, "table")
@@ -58,12 +60,13 @@ print("✅ team_batting_stats.csv saved with", len(batting_df), "teams")
 # ----------------------
 pitching_url = "https://sports.yahoo.com/mlb/stats/team/?selectedTable=1&leagueStructure="
 print(f"\nLoading pitching stats page: {pitching_url}")
-driver.get(pitching_url)
+driver.get(http_transport.browser_url(pitching_url))
 
 WebDriverWait(driver, 30).until(
     EC.presence_of_all_elements_located((By.CSS_SELECTOR, "table tbody tr"))
 )
 time.sleep(4)
+http_transport.record_page(pitching_url, driver.page_source)
 
 print("Extracting pitching table...")
 table = driver.find_element(By.CSS_SELECTOR, "table")
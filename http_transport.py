@@ -0,0 +1,139 @@
+# http_transport.py
+# Single HTTP entry point for every network path (MLB StatsAPI, Sportradar, Yahoo scraper).
+#
+# Modes (BBB_HTTP_MODE):
+#   live    - talk to the real endpoints (default)
+#   record  - talk to the real endpoints and save every successful response to the cassette dir
+#   replay  - serve responses from the cassette dir only; never touches the network
+#
+# BBB_MLB_API_BASE / BBB_SPORTRADAR_API_BASE redirect the real hosts to another base URL,
+# e.g. http://127.0.0.1:8765 when running against api_stub_server.py.
+
+import os
+import json
+import hashlib
+import tempfile
+from urllib.parse import urlsplit, urlunsplit, urlencode, parse_qsl
+
+import requests
+
+MODE = os.getenv("BBB_HTTP_MODE", "live")
+CASSETTE_DIR = os.getenv("BBB_HTTP_CASSETTE_DIR", "http_cassettes")
+HOST_OVERRIDES = {
+    "https://statsapi.mlb.com": os.getenv("BBB_MLB_API_BASE"),
+    "https://api.sportradar.com": os.getenv("BBB_SPORTRADAR_API_BASE"),
+}
+# Never written to cassettes or used in cassette keys
+SECRET_PARAMS = {"api_key"}
+
+# One pooled session so repeated calls to the same host reuse connections
+_session = requests.Session()
+
+
+class CassetteMissError(requests.RequestException):
+    """Raised in replay mode when no recording exists for a request."""
+
+
+def configure(mode=None, cassette_dir=None, mlb_base=None, sportradar_base=None):
+    """Overrides the environment-derived settings at runtime (used by load_test.py)."""
+    global MODE, CASSETTE_DIR
+    if mode:
+        MODE = mode
+    if cassette_dir:
+        CASSETTE_DIR = cassette_dir
+    if mlb_base:
+        HOST_OVERRIDES["https://statsapi.mlb.com"] = mlb_base
+    if sportradar_base:
+        HOST_OVERRIDES["https://api.sportradar.com"] = sportradar_base
+
+
+def rewrite_url(url):
+    """Points a real API URL at its configured override base, if any."""
+    for real_base, override in HOST_OVERRIDES.items():
+        if override and url.startswith(real_base):
+            return override.rstrip("/") + url[len(real_base):]
+    return url
+
+
+def cassette_key(url, params=None):
+    """Returns a stable key for a request: the URL with sorted, secret-free query params."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query) + list((params or {}).items())
+    query = sorted((k, str(v)) for k, v in query if k not in SECRET_PARAMS)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+
+
+def cassette_path(key, extension="json"):
+    """Maps a cassette key to a file in the cassette dir."""
+    digest = hashlib.sha1(key.encode()).hexdigest()[:20]
+    return os.path.join(CASSETTE_DIR, f"{digest}.{extension}")
+
+
+def _write_cassette(path, text):
+    """Writes a cassette atomically so concurrent recorders never leave a truncated file behind."""
+    os.makedirs(CASSETTE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=CASSETTE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _save_response(key, response):
+    _write_cassette(cassette_path(key), json.dumps({
+        "key": key,
+        "status_code": response.status_code,
+        "headers": {"Content-Type": response.headers.get("Content-Type", "application/json")},
+        "body": response.text
+    }))
+
+
+def _load_response(key):
+    path = cassette_path(key)
+    if not os.path.exists(path):
+        raise CassetteMissError(f"No recorded response for {key}")
+    with open(path, 'r') as f:
+        recorded = json.load(f)
+    response = requests.Response()
+    response.status_code = recorded["status_code"]
+    response.headers.update(recorded["headers"])
+    response._content = recorded["body"].encode("utf-8")
+    response.encoding = "utf-8"
+    response.url = key
+    return response
+
+
+def get(url, params=None, timeout=10):
+    """Drop-in replacement for requests.get that honours the record/replay mode and host overrides."""
+    key = cassette_key(url, params)
+    if MODE == "replay":
+        return _load_response(key)
+
+    response = _session.get(rewrite_url(url), params=params, timeout=timeout)
+    # Throttled or failed responses are not recorded, so they can never shadow a good cassette in replay
+    if MODE == "record" and 200 <= response.status_code < 300:
+        _save_response(key, response)
+    return response
+
+
+# -----------------------------
+# BROWSER PAGES (Selenium scraper)
+# -----------------------------
+
+def browser_url(url):
+    """Returns the URL the browser should load: a file:// cassette in replay mode, else the real URL."""
+    if MODE == "replay":
+        path = cassette_path(cassette_key(url), extension="html")
+        if not os.path.exists(path):
+            raise CassetteMissError(f"No recorded page for {url}")
+        return "file://" + os.path.abspath(path)
+    return url
+
+
+def record_page(url, page_source):
+    """Saves a rendered page in record mode so the scraper can be replayed offline."""
+    if MODE == "record":
+        _write_cassette(cassette_path(cassette_key(url), extension="html"), page_source)
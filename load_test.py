@@ -0,0 +1,222 @@
+# load_test.py
+# Load-tests ingestion and dashboard refresh through http_transport, normally against api_stub_server.py.
+#
+# Examples:
+#   python load_test.py --start-stub --scenario dashboard --rate 50 --duration 30
+#   python load_test.py --start-stub --stub-latency-ms 120 --stub-rate-429 0.05 --scenario stats --rate 200
+#   python load_test.py --start-stub --stub-scale 4 --scenario populate
+#   python load_test.py --start-stub --mode record --scenario dashboard --dashboard-date 2025-07-24 --rate 1 --duration 1
+#   python load_test.py --mode replay --scenario dashboard --dashboard-date 2025-07-24 --rate 500   # no server
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import requests
+
+import http_transport
+
+# Same endpoints the app uses (see mlb_model.py and baseball_populate.py)
+MLB_API_SCHEDULE = "https://statsapi.mlb.com/api/v1/schedule"
+SPORTRADAR_BASE = "https://api.sportradar.com/mlb/trial/v8/en"
+STUB_PORT = 8765
+
+# -----------------------------
+# SCENARIOS (one request each)
+# -----------------------------
+
+def dashboard_refresh(today=None):
+    """Mirrors mlb_model.fetch_schedule for yesterday..tomorrow around today (or a pinned date)."""
+    today = today or date.today()
+    params = {
+        "sportId": 1,
+        "startDate": (today - timedelta(days=1)).isoformat(),
+        "endDate": (today + timedelta(days=1)).isoformat(),
+        "hydrate": "probablePitcher,team,linescore"
+    }
+    return http_transport.get(MLB_API_SCHEDULE, params=params)
+
+
+def team_statistics(team_ids):
+    """Mirrors one populate_statistics request for a random team."""
+    url = f"{SPORTRADAR_BASE}/seasons/2025/REG/teams/{random.choice(team_ids)}/statistics.json?api_key=stub"
+    return http_transport.get(url)
+
+
+def season_schedule():
+    """Mirrors the populate_schedule request."""
+    return http_transport.get(f"{SPORTRADAR_BASE}/games/2025/REG/schedule.json?api_key=stub")
+
+
+def load_team_ids(attempts=5):
+    """Fetches the team ids the stats scenario samples from, retrying through injected 429s."""
+    for attempt in range(attempts):
+        response = http_transport.get(f"{SPORTRADAR_BASE}/league/teams.json?api_key=stub")
+        if response.status_code != 429 or attempt == attempts - 1:
+            break
+        time.sleep(min(float(response.headers.get("Retry-After", 1)), 1))
+    response.raise_for_status()
+    return [team["id"] for team in response.json()["teams"]]
+
+# -----------------------------
+# RUNNERS
+# -----------------------------
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+
+def run_rate_test(request_fn, rate, duration, workers):
+    """Issues requests at a fixed open-loop rate and reports achieved throughput and latency."""
+    latencies = []
+    outcomes = Counter()
+    body_bytes = 0
+    lock = threading.Lock()
+
+    def one_request(scheduled_at):
+        nonlocal body_bytes
+        try:
+            response = request_fn()
+            # Latency is measured from the scheduled send time, so queueing behind busy workers counts
+            elapsed = time.perf_counter() - scheduled_at
+            outcome, size = str(response.status_code), len(response.content)
+        except Exception as e:
+            # Anything else (e.g. a corrupt cassette or a failed cassette write) must still show up in the report
+            elapsed, outcome, size = time.perf_counter() - scheduled_at, type(e).__name__, 0
+        with lock:
+            latencies.append(elapsed)
+            outcomes[outcome] += 1
+            body_bytes += size
+
+    total = int(rate * duration)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for i in range(total):
+            scheduled_at = start + i / rate
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(one_request, scheduled_at)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    ok = outcomes.get("200", 0)
+    print(f"\nRequests: {total} in {elapsed:.1f}s (target {rate:.1f}/s, achieved {total / elapsed:.1f}/s)")
+    print(f"Successful: {ok} ({ok / elapsed:.1f}/s), payload {body_bytes / elapsed / 1e6:.2f} MB/s")
+    print(f"Outcomes: {dict(outcomes)}")
+    print(f"Latency ms: p50 {percentile(latencies, 50) * 1000:.0f}, p95 {percentile(latencies, 95) * 1000:.0f}, "
+          f"p99 {percentile(latencies, 99) * 1000:.0f}, max {percentile(latencies, 100) * 1000:.0f}")
+
+
+def count_rows(db_path, tables):
+    """Returns the total row count across tables, treating missing tables as empty."""
+    conn = sqlite3.connect(db_path)
+    try:
+        total = 0
+        for table in tables:
+            try:
+                total += conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            except sqlite3.OperationalError:
+                pass
+        return total
+    finally:
+        conn.close()
+
+
+def run_populate_test():
+    """Runs the full baseball_populate ingestion into a throwaway database and times each stage.
+    populate_* only report failures via print, so each stage also shows the rows it wrote and its error lines."""
+    os.environ.setdefault("SPORTRADAR_API_KEY", "stub")
+    import baseball_populate
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "load_test.db")
+        baseball_populate.DB_PATH = db_path
+        stages = [
+            ("setup_database", baseball_populate.setup_database, []),
+            ("populate_teams", baseball_populate.populate_teams, ["teams"]),
+            ("populate_statistics", baseball_populate.populate_statistics, ["statistics"]),
+            ("populate_schedule", baseball_populate.populate_schedule, ["schedule"]),
+            ("build_entity_index", lambda: baseball_populate.build_entity_index(db_path),
+             ["team_entities", "venue_entities", "game_entities"]),
+        ]
+        print(f"\n{'stage':<22} {'time':>9} {'rows':>8} {'errors':>7}")
+        total_start = time.perf_counter()
+        for name, stage, tables in stages:
+            rows_before = count_rows(db_path, tables)
+            captured = io.StringIO()
+            stage_start = time.perf_counter()
+            # populate_* print every response (including the full schedule JSON), so keep the report readable
+            with contextlib.redirect_stdout(captured):
+                stage()
+            elapsed = time.perf_counter() - stage_start
+            rows = count_rows(db_path, tables) - rows_before
+            errors = [line for line in captured.getvalue().splitlines()
+                      if "error" in line.lower() or "failed" in line.lower()]
+            print(f"{name:<22} {elapsed:8.2f}s {rows:8d} {len(errors):7d}")
+            if errors:
+                print(f"    first error: {errors[0][:160]}")
+        print(f"{'total':<22} {time.perf_counter() - total_start:8.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test ingestion and dashboard refresh offline")
+    parser.add_argument("--scenario", choices=["dashboard", "stats", "schedule", "populate"], default="dashboard")
+    parser.add_argument("--rate", type=float, default=20, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds to sustain the target rate")
+    parser.add_argument("--workers", type=int, default=32, help="Concurrent client threads")
+    parser.add_argument("--dashboard-date", type=date.fromisoformat,
+                        help="Pin the dashboard scenario's 'today' (YYYY-MM-DD) so its cassettes replay on any day")
+    parser.add_argument("--mode", choices=["live", "record", "replay"], help="Override BBB_HTTP_MODE")
+    parser.add_argument("--cassette-dir", help="Override BBB_HTTP_CASSETTE_DIR")
+    parser.add_argument("--start-stub", action="store_true", help="Run api_stub_server in-process and point both APIs at it")
+    parser.add_argument("--stub-latency-ms", type=float, default=0)
+    parser.add_argument("--stub-jitter-ms", type=float, default=0)
+    parser.add_argument("--stub-rate-429", type=float, default=0.0)
+    parser.add_argument("--stub-scale", type=float, default=1.0)
+    args = parser.parse_args()
+
+    http_transport.configure(mode=args.mode, cassette_dir=args.cassette_dir)
+    server = None
+    if args.start_stub:
+        from api_stub_server import start_server
+        server = start_server(port=STUB_PORT, latency_ms=args.stub_latency_ms, jitter_ms=args.stub_jitter_ms,
+                              rate_429=args.stub_rate_429, scale=args.stub_scale)
+        base = f"http://127.0.0.1:{STUB_PORT}"
+        http_transport.configure(mlb_base=base, sportradar_base=base)
+        print(f"Stub API running at {base}")
+    elif http_transport.MODE != "replay" and not any(http_transport.HOST_OVERRIDES.values()):
+        print("⚠️ No stub or replay configured: requests will hit the live APIs")
+
+    try:
+        if args.scenario == "populate":
+            run_populate_test()
+        else:
+            if args.scenario == "dashboard":
+                request_fn = lambda: dashboard_refresh(args.dashboard_date)
+            elif args.scenario == "stats":
+                team_ids = load_team_ids()
+                request_fn = lambda: team_statistics(team_ids)
+            else:
+                request_fn = season_schedule
+            run_rate_test(request_fn, args.rate, args.duration, args.workers)
+    except requests.RequestException as e:
+        print(f"❌ Setup request failed, load test not run: {e}")
+    finally:
+        if server:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import requests
+import http_transport  # Record/replay-aware replacement for requests.get
 import os
 import json
 from datetime import date, datetime, timedelta
@@ -31,7 +31,7 @@ def fetch_schedule(start_date, end_date):
         "endDate": end_date,
         "hydrate": "probablePitcher,team,linescore"
     }
-    res = requests.get(MLB_API_SCHEDULE, params=params)
+    res = http_transport.get(MLB_API_SCHEDULE, params=params)
     res.raise_for_status()
     return res.json()
 
@@ -0,0 +1,176 @@
+# tune_model.py
+# Hyperparameter search for the MLB win prediction model using time-ordered cross-validation.
+# Runs every (config, fold) pair across all cores, caches the feature matrix and fold indices
+# on disk, and memoizes finished (config, fold) results so an interrupted search resumes.
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Memory, Parallel, delayed, dump, load
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score, brier_score_loss, log_loss
+from sklearn.model_selection import ParameterGrid, TimeSeriesSplit
+
+# -------------------------------
+# CONFIG
+# -------------------------------
+HISTORY_FILE = "mlb_prediction_history.csv"
+CACHE_DIR = ".tune_cache"
+RESULTS_FILE = "tune_results.csv"
+FEATURE_COLUMNS = ["home_offense", "away_offense", "home_pitching", "away_pitching"]
+# Bump when the feature inputs change without touching build_feature_matrix (its source is hashed too)
+FEATURE_VERSION = 1
+
+# Default search space; override with --grid path/to/grid.json
+PARAM_GRID = {
+    "n_estimators": [100, 200, 400],
+    "max_depth": [None, 4, 8, 16],
+    "min_samples_leaf": [1, 5, 20],
+    "max_features": ["sqrt", 0.5, 1.0],
+    "class_weight": [None, "balanced"],
+}
+
+# -------------------------------
+# FEATURE MATRIX + FOLDS (cached on disk)
+# -------------------------------
+
+def build_feature_matrix(history_df):
+    """Builds time-ordered features and home-win labels from the prediction history.
+    NOTE: Features are mocked the same way as retrain_model.py; replace with real team stats later."""
+    # The dashboard appends completed games on every refresh, so each GamePk can appear more than once
+    history_df = history_df.dropna(subset=["Actual Winner"]).drop_duplicates(subset="GamePk").copy()
+    history_df["Date"] = pd.to_datetime(history_df["Date"])
+    history_df = history_df.sort_values("Date", kind="stable").reset_index(drop=True)
+
+    rng = np.random.RandomState(42)
+    X = np.column_stack([rng.uniform(0.2, 0.8, len(history_df)) for _ in FEATURE_COLUMNS])
+    home_team = history_df["Game"].str.split(" @ ").str[1]
+    y = (history_df["Actual Winner"] == home_team).astype(int).to_numpy()
+    return X, y
+
+def prepare_dataset(history_file, n_splits, cache_dir):
+    """Loads (or builds and caches) the feature matrix and fold indices. Returns (data_path, fingerprint)."""
+    with open(history_file, 'rb') as f:
+        # Any change to the features invalidates the cached matrix and every memoized fold result
+        features = f"|splits={n_splits}|features={FEATURE_VERSION}:{','.join(FEATURE_COLUMNS)}"
+        features += inspect.getsource(build_feature_matrix)
+        fingerprint = hashlib.sha1(f.read() + features.encode()).hexdigest()[:16]
+    data_path = os.path.join(cache_dir, f"dataset_{fingerprint}.joblib")
+    if os.path.exists(data_path):
+        print(f"Using cached feature matrix and folds: {data_path}")
+        return data_path, fingerprint
+
+    X, y = build_feature_matrix(pd.read_csv(history_file))
+    if len(y) <= n_splits:
+        raise ValueError(f"Need more than {n_splits} completed games for {n_splits}-fold CV, found {len(y)}")
+
+    # Each fold trains on earlier games and validates on the block that follows
+    folds = list(TimeSeriesSplit(n_splits=n_splits).split(X))
+    os.makedirs(cache_dir, exist_ok=True)
+    dump({"X": X, "y": y, "folds": folds}, data_path)
+    print(f"Cached feature matrix ({X.shape[0]} games) and {n_splits} folds to {data_path}")
+    return data_path, fingerprint
+
+# -------------------------------
+# (CONFIG, FOLD) EVALUATION
+# -------------------------------
+
+def evaluate_fold(config_json, fold, data_path, fingerprint):
+    """Fits one config on one fold and returns its validation metrics.
+    fingerprint is unused here but part of the memoization key, so a new dataset never reuses old results."""
+    # mmap keeps a single copy of the feature matrix shared between worker processes
+    data = load(data_path, mmap_mode="r")
+    train_idx, test_idx = data["folds"][fold]
+    X, y = data["X"], data["y"]
+
+    start = time.perf_counter()
+    # Parallelism comes from running many fits at once, so each forest uses a single core
+    model = RandomForestClassifier(random_state=42, n_jobs=1, **json.loads(config_json))
+    model.fit(X[train_idx], y[train_idx])
+    proba = model.predict_proba(X[test_idx])
+    # A fold whose training data holds one class yields a single probability column
+    prob_home = proba[:, list(model.classes_).index(1)] if 1 in model.classes_ else np.zeros(len(test_idx))
+
+    return {
+        "accuracy": accuracy_score(y[test_idx], (prob_home >= 0.5).astype(int)),
+        "log_loss": log_loss(y[test_idx], np.clip(prob_home, 1e-6, 1 - 1e-6), labels=[0, 1]),
+        "brier": brier_score_loss(y[test_idx], prob_home),
+        "fit_seconds": time.perf_counter() - start,
+    }
+
+def run_search(param_grid, history_file=HISTORY_FILE, n_splits=5, n_jobs=-1, cache_dir=CACHE_DIR):
+    """Evaluates every config in param_grid on every fold and returns results ranked by mean log loss."""
+    data_path, fingerprint = prepare_dataset(history_file, n_splits, cache_dir)
+    memory = Memory(os.path.join(cache_dir, "results"), verbose=0)
+    cached_evaluate = memory.cache(evaluate_fold)
+
+    configs = [json.dumps(config, sort_keys=True) for config in ParameterGrid(param_grid)]
+    tasks = [(config, fold) for config in configs for fold in range(n_splits)]
+    pending = [task for task in tasks if not cached_evaluate.check_call_in_cache(task[0], task[1], data_path, fingerprint)]
+    print(f"{len(configs)} configs x {n_splits} folds = {len(tasks)} fits ({len(tasks) - len(pending)} already cached)")
+
+    start = time.perf_counter()
+    Parallel(n_jobs=n_jobs, verbose=5)(
+        delayed(cached_evaluate)(config, fold, data_path, fingerprint) for config, fold in pending
+    )
+    elapsed = time.perf_counter() - start
+    if pending:
+        print(f"Ran {len(pending)} fits in {elapsed:.1f}s ({len(pending) / elapsed:.2f} fits/s)")
+
+    # Every task is now cached, so collecting results is a cheap disk read
+    rows = []
+    for config, fold in tasks:
+        metrics = cached_evaluate(config, fold, data_path, fingerprint)
+        rows.append({"config": config, "fold": fold, **metrics})
+    fold_df = pd.DataFrame(rows)
+
+    ranked = (fold_df.groupby("config")
+              .agg(mean_log_loss=("log_loss", "mean"), std_log_loss=("log_loss", "std"),
+                   mean_accuracy=("accuracy", "mean"), mean_brier=("brier", "mean"),
+                   fit_seconds=("fit_seconds", "sum"))
+              .sort_values(["mean_log_loss", "mean_accuracy"], ascending=[True, False])
+              .reset_index())
+    ranked.insert(0, "rank", range(1, len(ranked) + 1))
+    return ranked
+
+# -------------------------------
+# CLI
+# -------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Time-ordered CV hyperparameter search for the MLB win model")
+    parser.add_argument("--history", default=HISTORY_FILE, help="Prediction history CSV to train on")
+    parser.add_argument("--grid", help="JSON file mapping parameter names to lists of values")
+    parser.add_argument("--splits", type=int, default=5, help="Number of time-ordered CV folds")
+    parser.add_argument("--jobs", type=int, default=-1, help="Parallel workers (-1 = all cores)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="Directory for cached folds and results")
+    parser.add_argument("--top", type=int, default=10, help="Number of ranked configs to print")
+    args = parser.parse_args()
+
+    param_grid = PARAM_GRID
+    if args.grid:
+        with open(args.grid, 'r') as f:
+            param_grid = json.load(f)
+
+    try:
+        ranked = run_search(param_grid, args.history, args.splits, args.jobs, args.cache_dir)
+    except FileNotFoundError:
+        print("❌ No history file found. Run predictions first to build history.")
+        return
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+
+    ranked.to_csv(RESULTS_FILE, index=False)
+    print(f"\nTop {args.top} configs by mean log loss:")
+    print(ranked.head(args.top).to_string(index=False))
+    print(f"✅ Full ranking saved to {RESULTS_FILE}")
+
+if __name__ == "__main__":
+    main()